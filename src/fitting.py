@@ -0,0 +1,268 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from scipy.integrate import solve_ivp
+from scipy.optimize import minimize
+
+from .simulation import PendulumSimulator
+
+PARAMETERS = ['m1', 'm2', 'm3', 'L1', 'L2', 'L3', 'b', 'g']
+
+DEFAULT_BOUNDS = [(0.05, 5.0)] * 6 + [(0.0, 1.0), (1.0, 20.0)]
+
+COMPLEX_STEP = 1e-20
+
+# Wrapped residuals never exceed pi, so this is the worst loss any trajectory can reach
+MAX_LOSS = np.pi**2
+
+
+def wrap_angle(angle):
+    """
+    Wrap angles to the interval [-pi, pi).
+
+    Args:
+        angle (np.ndarray): The angles to wrap, in radians.
+
+    Returns:
+        np.ndarray: The wrapped angles.
+    """
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+class PendulumFitter:
+    """
+    A class to estimate the pendulum parameters from measured angle series.
+
+    The recording is split into short windows, each integrated from the measured
+    state at its start, so that the chaotic dynamics do not make the loss
+    surface unusable over long recordings. Candidates and windows are solved
+    together as one batch with PendulumSimulator.derivatives_batch, and
+    gradients come from forward sensitivity equations integrated alongside
+    the state. Angles alone only determine the masses and b up to a common
+    scale factor, so only their ratios should be read from a fit.
+    """
+    def __init__(self, t, thetas, window=2.0, rtol=1e-6, atol=1e-8):
+        """
+        Initialize the PendulumFitter.
+
+        Args:
+            t (np.ndarray): Uniformly spaced sample times of shape (T,).
+            thetas (np.ndarray): Measured angles [theta1, theta2, theta3] of shape (T, 3).
+            window (float): Length of each fitting window in seconds.
+            rtol (float): Relative tolerance of the integrator.
+            atol (float): Absolute tolerance of the integrator.
+        """
+        self.simulator = PendulumSimulator()
+        self.rtol = rtol
+        self.atol = atol
+
+        t = np.asarray(t, dtype=float)
+        thetas = np.unwrap(np.asarray(thetas, dtype=float), axis=0)
+        omegas = np.gradient(thetas, t, axis=0)
+
+        samples = max(int(round(window / (t[1] - t[0]))), 1) + 1
+        starts = np.arange(0, len(t) - samples + 1, samples - 1)
+        self.window_t = t[:samples] - t[0]
+        self.window_y0 = np.stack([thetas[starts, 0], omegas[starts, 0],
+                                   thetas[starts, 1], omegas[starts, 1],
+                                   thetas[starts, 2], omegas[starts, 2]])
+        self.window_thetas = np.stack([thetas[starts[:, None] + np.arange(samples), i] for i in range(3)])
+        self.n_windows = len(starts)
+
+    def _batch_parameters(self, candidates):
+        """
+        Repeat every candidate parameter set once per window.
+
+        Args:
+            candidates (np.ndarray): Candidate parameter sets of shape (N, 8).
+
+        Returns:
+            np.ndarray: Parameters of shape (8, N * W), ordered candidate-major.
+        """
+        return np.repeat(np.atleast_2d(candidates).T, self.n_windows, axis=1)
+
+    def _residuals(self, y, n_candidates):
+        """
+        Compute the wrapped angle residuals of a batched solution.
+
+        Args:
+            y (np.ndarray): Solution states of shape (6 * N * W, n).
+            n_candidates (int): Number of candidates N in the batch.
+
+        Returns:
+            np.ndarray: Residuals of shape (3, N, W, n).
+        """
+        theta = y.reshape(6, n_candidates, self.n_windows, -1)[0::2]
+        return wrap_angle(theta - self.window_thetas[:, None])
+
+    def is_feasible(self, candidates):
+        """
+        Check that the mass matrix stays positive definite along the measured angles.
+
+        Parameter sets that make the mass matrix singular near the recorded motion
+        send the integrator into ever smaller steps, so they are rejected up front.
+
+        Args:
+            candidates (np.ndarray): Candidate parameter sets of shape (N, 8).
+
+        Returns:
+            np.ndarray: A boolean mask of shape (N,).
+        """
+        m1, m2, m3, L1, L2, L3, _, _ = np.atleast_2d(candidates).T[:, :, None]
+        theta1, theta2, theta3 = self.window_thetas.reshape(3, 1, -1)
+        c12, c13, c23 = np.cos(theta1 - theta2), np.cos(theta1 - theta3), np.cos(theta2 - theta3)
+
+        # Leading principal minors of the mass matrix used in derivatives_batch
+        a, d, f = (m1 + m2 + m3) * L1, (m2 + m3) * L2**2, m3 * L3**2
+        b, c, e = (m2 + m3) * L1 * L2 * c12, m3 * L1 * L3 * c13, m3 * L2 * L3 * c23
+        minor2 = a * d - b**2
+        minor3 = a * (d * f - e**2) - b * (b * f - c * e) + c * (b * e - c * d)
+        return np.all((minor2 > 0) & (minor3 > 0), axis=1)
+
+    def evaluate_batch(self, candidates, substeps=4):
+        """
+        Compute the loss of many candidate parameter sets in one batched solve.
+
+        Screening uses a fixed-step RK4 scheme rather than solve_ivp: with a shared
+        adaptive step, a single badly behaved candidate would slow down the whole
+        batch, whereas here every member fails or succeeds on its own.
+
+        Args:
+            candidates (np.ndarray): Candidate parameter sets of shape (N, 8), in the order of PARAMETERS.
+            substeps (int): Number of RK4 steps between consecutive samples.
+
+        Returns:
+            np.ndarray: The mean squared angle error of each candidate, shape (N,). Infeasible
+                        or diverging candidates get MAX_LOSS.
+        """
+        candidates = np.atleast_2d(candidates)
+        n_candidates = len(candidates)
+        params = tuple(self._batch_parameters(candidates))
+        h = (self.window_t[1] - self.window_t[0]) / substeps
+
+        y = np.tile(self.window_y0[:, None, :], (1, n_candidates, 1)).ravel()
+        ys = [y]
+        with np.errstate(all='ignore'):
+            for _ in range(len(self.window_t) - 1):
+                for _ in range(substeps):
+                    k1 = self.simulator.derivatives_batch(0, y, *params)
+                    k2 = self.simulator.derivatives_batch(0, y + h / 2 * k1, *params)
+                    k3 = self.simulator.derivatives_batch(0, y + h / 2 * k2, *params)
+                    k4 = self.simulator.derivatives_batch(0, y + h * k3, *params)
+                    y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+                ys.append(y)
+
+            residuals = self._residuals(np.stack(ys, axis=-1), n_candidates)
+            losses = np.mean(residuals**2, axis=(0, 2, 3))
+        losses[~np.isfinite(losses) | ~self.is_feasible(candidates)] = MAX_LOSS
+        return losses
+
+    def sensitivity_derivatives(self, t, z, *params):
+        """
+        Compute the derivatives of the state and its parameter sensitivities.
+
+        The sensitivities S = dy/dp follow dS/dt = J_y S + J_p. Both Jacobians are
+        obtained exactly, up to rounding, by complex-step differentiation of the
+        batched equations of motion in a single call.
+
+        Args:
+            t (float): The current time.
+            z (np.ndarray): Flattened state (6, K) followed by the sensitivities (6, 8, K).
+            *params (np.ndarray): The eight parameter arrays of shape (K,), in the order of PARAMETERS.
+
+        Returns:
+            np.ndarray: The flattened derivatives, with the same layout as z.
+        """
+        n_members = len(params[0])
+        y = z[:6 * n_members].reshape(6, n_members)
+        S = z[6 * n_members:].reshape(6, 8, n_members)
+
+        # Perturb each state variable and each parameter along the imaginary axis
+        steps = 1j * COMPLEX_STEP * np.eye(14)[:, :, None]
+        Y = y[:, None, :] + steps[:6]
+        P = np.asarray(params)[:, None, :] + steps[6:]
+
+        f = self.simulator.derivatives_batch(t, Y.ravel(), *P.reshape(8, -1)).reshape(6, 14, n_members)
+        J_y = f.imag[:, :6] / COMPLEX_STEP
+        J_p = f.imag[:, 6:] / COMPLEX_STEP
+
+        dS = np.einsum('ijk,jpk->ipk', J_y, S) + J_p
+        return np.concatenate([f.real[:, 0].ravel(), dS.ravel()])
+
+    def loss_and_gradient(self, candidate):
+        """
+        Compute the loss of one candidate and its gradient from the forward sensitivities.
+
+        Args:
+            candidate (np.ndarray): Parameter set of shape (8,), in the order of PARAMETERS.
+
+        Returns:
+            tuple: The mean squared angle error and its gradient of shape (8,). Infeasible
+                   candidates or failed integrations get MAX_LOSS and a zero gradient, which
+                   keeps the optimizer's line search finite.
+        """
+        if not self.is_feasible(candidate)[0]:
+            return MAX_LOSS, np.zeros(len(PARAMETERS))
+
+        n_members = self.n_windows
+        z0 = np.concatenate([self.window_y0.ravel(), np.zeros(6 * 8 * n_members)])
+
+        solution = solve_ivp(
+            self.sensitivity_derivatives, (0, self.window_t[-1]), z0, t_eval=self.window_t,
+            args=tuple(self._batch_parameters(candidate)),
+            method='RK45', rtol=self.rtol, atol=self.atol
+        )
+        if solution.status != 0:
+            return MAX_LOSS, np.zeros(len(PARAMETERS))
+
+        residuals = self._residuals(solution.y[:6 * n_members], 1)[:, 0]
+        S = solution.y[6 * n_members:].reshape(6, 8, n_members, -1)[0::2]
+
+        loss = np.mean(residuals**2)
+        gradient = 2 * np.einsum('iwn,ipwn->p', residuals, S) / residuals.size
+        return loss, gradient
+
+    def fit(self, n_starts=8, n_candidates=256, bounds=None, n_workers=None, seed=None):
+        """
+        Estimate the pendulum parameters with a multi-start optimization.
+
+        Random candidates are first screened in one batched evaluation; the best
+        of them are then refined with L-BFGS-B in parallel worker processes.
+
+        Args:
+            n_starts (int): Number of screened candidates to refine.
+            n_candidates (int): Number of random candidates to screen.
+            bounds (list): (low, high) bounds for each parameter, defaults to DEFAULT_BOUNDS.
+            n_workers (int): Number of worker processes, defaults to the number of cores.
+            seed (int): Seed for drawing the random candidates.
+
+        Returns:
+            tuple: A dictionary with the estimated parameters and the final loss.
+        """
+        bounds = bounds or DEFAULT_BOUNDS
+        low, high = np.array(bounds).T
+        candidates = np.random.default_rng(seed).uniform(low, high, size=(n_candidates, len(PARAMETERS)))
+
+        losses = self.evaluate_batch(candidates)
+        starts = candidates[np.argsort(losses)[:n_starts]]
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_refine, repeat(self), starts, repeat(bounds)))
+
+        best = min(results, key=lambda result: result.fun)
+        return dict(zip(PARAMETERS, best.x)), best.fun
+
+
+def _refine(fitter, start, bounds):
+    """
+    Refine a single starting point; module level so that it can be sent to worker processes.
+
+    Args:
+        fitter (PendulumFitter): The fitter holding the measured data.
+        start (np.ndarray): Starting parameter set of shape (8,).
+        bounds (list): (low, high) bounds for each parameter.
+
+    Returns:
+        OptimizeResult: The result of the L-BFGS-B optimization.
+    """
+    return minimize(fitter.loss_and_gradient, start, jac=True, method='L-BFGS-B', bounds=bounds)
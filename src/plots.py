@@ -23,6 +23,60 @@ def setup_pendulum_plot():
 
     return pendulum_plot, pendulum_curve, pendulum_points, trace_curves
 
+def setup_comparison_plot(n_members):
+    """
+    Set up the plot for comparing an ensemble of pendulums side by side.
+
+    All members share one line item for the rods, one for the tip traces and one
+    scatter item for the bobs, so the number of graphics items does not grow with
+    the ensemble size. Each member gets its own bob color, spread evenly around
+    the hue wheel.
+
+    Args:
+        n_members (int): Number of pendulums in the ensemble.
+
+    Returns:
+        tuple: A tuple containing the comparison plot widget, the rod curve, the bob
+               scatter item, the tip trace curve, and the list of per-member brushes.
+    """
+    comparison_plot = pg.PlotWidget()
+    comparison_plot.setAspectLocked()
+    comparison_plot.setBackground('k')
+    comparison_plot.hideAxis('left')
+    comparison_plot.hideAxis('bottom')
+    rod_curve = comparison_plot.plot(pen=pg.mkPen(255, 255, 255, 60, width=1))
+
+    trace_curve = comparison_plot.plot(pen=pg.mkPen(255, 165, 0, 80, width=1))
+
+    bob_points = pg.ScatterPlotItem(size=8, pen=None)
+    comparison_plot.addItem(bob_points)
+
+    member_brushes = [pg.mkBrush(pg.intColor(i, hues=max(n_members, 1))) for i in range(n_members)]
+
+    return comparison_plot, rod_curve, bob_points, trace_curve, member_brushes
+
+def setup_divergence_plot():
+    """
+    Set up the divergence plot for the comparison mode.
+
+    This function creates a plot widget with a logarithmic y axis for displaying
+    how far the ensemble members drift from the reference pendulum over time.
+
+    Returns:
+        tuple: A tuple containing the divergence plot widget and the curves for the
+               mean and maximum divergence.
+    """
+    divergence_plot = pg.PlotWidget()
+    divergence_plot.addLegend()
+    divergence_plot.setTitle("Divergence vs Time")
+    divergence_plot.setLabel('left', 'Phase-Space Distance')
+    divergence_plot.setLabel('bottom', 'Time (s)')
+    divergence_plot.setLogMode(y=True)
+    mean_curve = divergence_plot.plot(pen='c', name='Mean')
+    max_curve = divergence_plot.plot(pen='m', name='Max')
+
+    return divergence_plot, mean_curve, max_curve
+
 def setup_energy_plot():
     """
     Set up the energy plot for the simulation.
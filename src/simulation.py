@@ -83,6 +83,83 @@ class PendulumSimulator:
             method='RK45', rtol=1e-8, atol=1e-8
         )
 
+    def derivatives_batch(self, t, state, m1, m2, m3, L1, L2, L3, b, g):
+        """
+        Compute the derivatives for a batch of independent pendulum systems.
+
+        The batch is integrated as one flat state vector so that a single
+        solve_ivp call advances every member with the same adaptive steps.
+        Parameters may be scalars shared by all members or arrays of shape (K,).
+
+        Args:
+            t (float): The current time.
+            state (np.ndarray): Flattened state of shape (6 * K,), laid out as (6, K) so that
+                row i holds state variable i for every member.
+            m1, m2, m3 (float or np.ndarray): Masses of the pendulums.
+            L1, L2, L3 (float or np.ndarray): Lengths of the pendulums.
+            b (float or np.ndarray): Damping coefficient.
+            g (float or np.ndarray): Acceleration due to gravity.
+
+        Returns:
+            np.ndarray: The flattened derivatives, with the same layout as the state.
+        """
+        theta1, omega1, theta2, omega2, theta3, omega3 = state.reshape(6, -1)
+        s1, s2, s3 = np.sin(theta1), np.sin(theta2), np.sin(theta3)
+        c12, c13, c23 = np.cos(theta1 - theta2), np.cos(theta1 - theta3), np.cos(theta2 - theta3)
+        s12, s13, s23 = np.sin(theta1 - theta2), np.sin(theta1 - theta3), np.sin(theta2 - theta3)
+        ones = np.ones_like(theta1)
+
+        # Mass matrices, one (3, 3) block per member; complex dtypes are kept for complex-step differentiation
+        M = np.empty(theta1.shape + (3, 3), dtype=np.result_type(theta1, m1, m2, m3, L1, L2, L3))
+        M[:, 0, 0] = (m1 + m2 + m3) * L1 * ones
+        M[:, 0, 1] = M[:, 1, 0] = (m2 + m3) * L1 * L2 * c12
+        M[:, 0, 2] = M[:, 2, 0] = m3 * L1 * L3 * c13
+        M[:, 1, 1] = (m2 + m3) * L2**2 * ones
+        M[:, 1, 2] = M[:, 2, 1] = m3 * L2 * L3 * c23
+        M[:, 2, 2] = m3 * L3**2 * ones
+
+        # Force plus Coriolis terms
+        rhs = np.stack([
+            -(m1 + m2 + m3) * g * L1 * s1 - b * omega1
+            + (m2 + m3) * L1 * L2 * omega2**2 * s12 + m3 * L1 * L3 * omega3**2 * s13,
+            -(m2 + m3) * g * L2 * s2 - b * omega2
+            - (m2 + m3) * L1 * L2 * omega1**2 * s12 + m3 * L2 * L3 * omega3**2 * s23,
+            -m3 * g * L3 * s3 - b * omega3
+            - m3 * L1 * L3 * omega1**2 * s13 - m3 * L2 * L3 * omega2**2 * s23
+        ], axis=-1)
+
+        # Solve all members' angular accelerations at once
+        alpha = np.linalg.solve(M, rhs[..., None])[..., 0]
+
+        return np.stack([omega1, alpha[:, 0], omega2, alpha[:, 1], omega3, alpha[:, 2]]).ravel()
+
+    def setup_batch_simulation(self, params, n_members, epsilon):
+        """
+        Integrate several copies of the pendulum whose starting angles differ slightly.
+
+        Member k starts with theta1 offset by k * epsilon; all other parameters are
+        shared. The whole ensemble is solved in one vectorized solve_ivp call.
+
+        Args:
+            params (dict): The simulation parameters, as used by setup_simulation.
+            n_members (int): Number of pendulums in the ensemble.
+            epsilon (float): Offset in radians between the theta1 of consecutive members.
+        """
+        offsets = epsilon * np.arange(n_members)
+        zeros = np.zeros(n_members)
+        y0 = np.stack([params['theta1'] + offsets, zeros,
+                       np.full(n_members, params['theta2']), zeros,
+                       np.full(n_members, params['theta3']), zeros]).ravel()
+        self.t_span = (0, params['sim_time'])
+        self.t_eval = np.linspace(0, params['sim_time'], int(params['sim_time'] * 50))  # 50 fps
+
+        self.solution = solve_ivp(
+            self.derivatives_batch, self.t_span, y0, t_eval=self.t_eval,
+            args=(params['m1'], params['m2'], params['m3'], params['L1'], params['L2'], params['L3'], params['b'], params['g']),
+            method='RK45', rtol=1e-8, atol=1e-8
+        )
+        self.batch_states = self.solution.y.reshape(6, n_members, -1)
+
     def get_positions(self, state, params):
         theta1, _, theta2, _, theta3, _ = state
         x1 = params['L1'] * np.sin(theta1)
@@ -107,3 +184,21 @@ class PendulumSimulator:
         E_total = E_kinetic + E_potential
 
         return E_kinetic, E_potential, E_total
+
+    def calculate_divergence(self, batch_states):
+        """
+        Measure how far each ensemble member has drifted from the first one.
+
+        Angle differences are wrapped to [-pi, pi) so that full revolutions do not
+        count as divergence.
+
+        Args:
+            batch_states (np.ndarray): Ensemble states of shape (6, K, T), with K >= 2.
+
+        Returns:
+            tuple: The mean and maximum phase-space distance to member 0, each of shape (T,).
+        """
+        delta = batch_states - batch_states[:, :1, :]
+        delta[0::2] = (delta[0::2] + np.pi) % (2 * np.pi) - np.pi
+        distance = np.sqrt(np.sum(delta**2, axis=0))
+        return distance[1:].mean(axis=0), distance.max(axis=0)
@@ -6,7 +6,7 @@ import pyqtgraph as pg
 import random
 
 from .simulation import PendulumSimulator
-from .plots import setup_pendulum_plot, setup_energy_plot, setup_velocity_plot
+from .plots import setup_pendulum_plot, setup_energy_plot, setup_velocity_plot, setup_comparison_plot, setup_divergence_plot
 from .utils import create_dark_palette
 
 class PendulumSimulation(QMainWindow):
@@ -35,6 +35,10 @@ class PendulumSimulation(QMainWindow):
         self.setPalette(create_dark_palette())
         self.showMaximized()
 
+        self.comparison_members = 50
+        self.comparison_epsilon = 1e-5
+        self.comparison_mode = False
+
         main_layout = QHBoxLayout()
 
         control_layout = self.setup_control_panel()
@@ -177,6 +181,22 @@ class PendulumSimulation(QMainWindow):
         self.randomize_button.clicked.connect(self.randomize_parameters)
         control_layout.addWidget(self.randomize_button)
 
+        self.compare_button = QPushButton('Start Divergence Comparison')
+        self.compare_button.setFont(slider_font)
+        self.compare_button.setStyleSheet("""
+            QPushButton {
+                background-color: #6f42c1;
+                color: white;
+                padding: 10px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #59359a;
+            }
+        """)
+        self.compare_button.clicked.connect(self.start_comparison)
+        control_layout.addWidget(self.compare_button)
+
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setStyleSheet("""
@@ -198,7 +218,9 @@ class PendulumSimulation(QMainWindow):
         """
         Set up the plots for the simulation.
 
-        This method creates the pendulum plot, energy plot, and velocity plot.
+        This method creates the pendulum plot, energy plot, and velocity plot, along
+        with the comparison and divergence plots, which stay hidden until the
+        comparison mode is started.
 
         Returns:
             QVBoxLayout: The layout containing the plot widgets.
@@ -214,6 +236,15 @@ class PendulumSimulation(QMainWindow):
         self.velocity_plot, self.omega1_curve, self.omega2_curve, self.omega3_curve = setup_velocity_plot()
         plot_layout.addWidget(self.velocity_plot)
 
+        (self.comparison_plot, self.comparison_rod_curve, self.comparison_bob_points,
+         self.comparison_trace_curve, self.comparison_brushes) = setup_comparison_plot(self.comparison_members)
+        self.comparison_plot.hide()
+        plot_layout.addWidget(self.comparison_plot)
+
+        self.divergence_plot, self.divergence_mean_curve, self.divergence_max_curve = setup_divergence_plot()
+        self.divergence_plot.hide()
+        plot_layout.addWidget(self.divergence_plot)
+
         return plot_layout
 
     def initialize_parameters(self):
@@ -309,10 +340,40 @@ class PendulumSimulation(QMainWindow):
         """
         params = self.get_parameters()
         self.simulator.setup_simulation(params)
+        self.set_comparison_mode(False)
         self.frame = 0
         self.trace_data = [[], [], []]
         self.timer.start(20)  # 50 fps
 
+    def start_comparison(self):
+        """
+        Start the divergence comparison of an ensemble of nearly identical pendulums.
+
+        This method solves every ensemble member in one batched integration and
+        precomputes the bob positions and divergence for all frames, so that each
+        timer tick only has to slice the arrays.
+        """
+        params = self.get_parameters()
+        self.simulator.setup_batch_simulation(params, self.comparison_members, self.comparison_epsilon)
+        self.comparison_positions = self.simulator.get_positions(self.simulator.batch_states, params)
+        self.comparison_divergence = self.simulator.calculate_divergence(self.simulator.batch_states)
+        self.set_comparison_mode(True)
+        self.frame = 0
+        self.timer.start(20)  # 50 fps
+
+    def set_comparison_mode(self, enabled):
+        """
+        Switch the visible plots between the single pendulum and the comparison mode.
+
+        Args:
+            enabled (bool): Whether to show the comparison and divergence plots.
+        """
+        self.comparison_mode = enabled
+        for plot in (self.pendulum_plot, self.energy_plot, self.velocity_plot):
+            plot.setVisible(not enabled)
+        for plot in (self.comparison_plot, self.divergence_plot):
+            plot.setVisible(enabled)
+
     def toggle_play_pause(self):
         """
         Toggle the play/pause state of the simulation.
@@ -336,6 +397,10 @@ class PendulumSimulation(QMainWindow):
             self.timer.stop()
             return
 
+        if self.comparison_mode:
+            self.update_comparison_plots()
+            return
+
         params = self.get_parameters()
         t = self.simulator.t_eval[:self.frame+1]
         solution = self.simulator.solution.y[:, :self.frame+1]
@@ -377,3 +442,41 @@ class PendulumSimulation(QMainWindow):
         self.progress_bar.setValue(int(100 * self.frame / len(self.simulator.t_eval)))
 
         self.frame += 1
+
+    def update_comparison_plots(self):
+        """
+        Update the comparison and divergence plots for the current frame.
+
+        All ensemble members are drawn with a single rod curve, a single trace curve
+        and a single scatter item; NaN separators keep the members' segments apart.
+        """
+        frame = self.frame
+        x1, y1, x2, y2, x3, y3 = (pos[:, frame] for pos in self.comparison_positions)
+        zeros = np.zeros(self.comparison_members)
+        gaps = np.full(self.comparison_members, np.nan)
+
+        # Update rods and bobs
+        self.comparison_rod_curve.setData(np.column_stack([zeros, x1, x2, x3, gaps]).ravel(),
+                                          np.column_stack([zeros, y1, y2, y3, gaps]).ravel(),
+                                          connect='finite')
+        self.comparison_bob_points.setData(np.concatenate([x1, x2, x3]), np.concatenate([y1, y2, y3]),
+                                           brush=self.comparison_brushes * 3)
+
+        # Update tip traces
+        t = self.simulator.t_eval
+        start = np.searchsorted(t, t[frame] - self.trace_duration)
+        trace_x = self.comparison_positions[4][:, start:frame+1]
+        trace_y = self.comparison_positions[5][:, start:frame+1]
+        self.comparison_trace_curve.setData(np.column_stack([trace_x, gaps]).ravel(),
+                                            np.column_stack([trace_y, gaps]).ravel(),
+                                            connect='finite')
+
+        # Update divergence plot
+        mean_divergence, max_divergence = self.comparison_divergence
+        self.divergence_mean_curve.setData(t[:frame+1], mean_divergence[:frame+1])
+        self.divergence_max_curve.setData(t[:frame+1], max_divergence[:frame+1])
+
+        # Update progress bar
+        self.progress_bar.setValue(int(100 * frame / len(t)))
+
+        self.frame += 1
@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from src.simulation import PendulumSimulator
+from src.fitting import PendulumFitter, PARAMETERS
+
+@pytest.fixture
+def params():
+    return {'m1': 1.0, 'm2': 0.8, 'm3': 0.6, 'L1': 1.0, 'L2': 0.9, 'L3': 0.7, 'b': 0.05, 'g': 9.8,
+            'theta1': np.radians(60), 'theta2': 0.5, 'theta3': -0.3, 'sim_time': 4}
+
+@pytest.fixture
+def fitter(params):
+    simulator = PendulumSimulator()
+    simulator.setup_simulation(params)
+    return PendulumFitter(simulator.t_eval, simulator.solution.y[0::2].T, window=1.0)
+
+def test_evaluate_batch_prefers_true_parameters(fitter, params):
+    """
+    Test to ensure the batched loss is lowest for the parameters that generated the data.
+
+    Args:
+        fitter: A PendulumFitter built from a simulated recording.
+        params: The parameters used for the recording.
+
+    Asserts:
+        The true parameters have a lower loss than perturbed ones.
+    """
+    true = np.array([params[p] for p in PARAMETERS])
+    losses = fitter.evaluate_batch(np.stack([true, true * 1.2, true * [1, 1, 1, 1.1, 1, 1, 1, 0.9]]))
+    assert losses[0] < losses[1]
+    assert losses[0] < losses[2]
+
+def test_gradient_matches_finite_differences(fitter, params):
+    """
+    Test to ensure the sensitivity gradient agrees with central finite differences.
+
+    Args:
+        fitter: A PendulumFitter built from a simulated recording.
+        params: The parameters used for the recording.
+
+    Asserts:
+        Each gradient component matches a finite-difference estimate of the loss.
+    """
+    candidate = np.array([params[p] for p in PARAMETERS]) * 1.1
+    loss, gradient = fitter.loss_and_gradient(candidate)
+    for i in range(len(PARAMETERS)):
+        step = np.zeros(len(PARAMETERS))
+        step[i] = 1e-6
+        finite_difference = (fitter.loss_and_gradient(candidate + step)[0] -
+                             fitter.loss_and_gradient(candidate - step)[0]) / 2e-6
+        assert np.isclose(gradient[i], finite_difference, rtol=1e-3, atol=1e-6)
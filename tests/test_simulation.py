@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from src.ui import PendulumSimulation
 
 @pytest.fixture
@@ -31,3 +32,39 @@ def test_start_simulation(simulation):
     simulation.start_simulation()
     assert simulation.timer.isActive()
     assert simulation.frame == 0
+
+def test_derivatives_batch_matches_single(simulation):
+    """
+    Test to ensure the batched derivatives agree with the single-pendulum ones.
+
+    Args:
+        simulation: An instance of the PendulumSimulation class.
+
+    Asserts:
+        Each column of the batched derivatives equals the derivatives of that member alone.
+    """
+    params = simulation.get_parameters()
+    args = [params[p] for p in ['m1', 'm2', 'm3', 'L1', 'L2', 'L3', 'b', 'g']]
+    states = np.random.default_rng(0).normal(size=(6, 4))
+    batch = simulation.simulator.derivatives_batch(0, states.ravel(), *args).reshape(6, 4)
+    for k in range(4):
+        assert np.allclose(batch[:, k], simulation.simulator.derivatives(0, states[:, k], *args))
+
+def test_start_comparison(simulation):
+    """
+    Test to ensure the comparison mode solves the whole ensemble and draws a frame.
+
+    Args:
+        simulation: An instance of the PendulumSimulation class.
+
+    Asserts:
+        The batched states hold one trajectory per ensemble member.
+        The frame count is incremented to 1 after updating plots.
+    """
+    simulation.initialize_parameters()
+    simulation.sliders['sim_time'].setValue(4)
+    simulation.start_comparison()
+    assert simulation.comparison_mode
+    assert simulation.simulator.batch_states.shape[:2] == (6, simulation.comparison_members)
+    simulation.update_plots()
+    assert simulation.frame == 1